@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Bulk syllabus generation for a whole course catalog.
+
+Reads a CSV or JSONL catalog (title, credits, ltp, audience), generates a
+syllabus for every row with bounded concurrency, writes the results to the
+courses collection in bulk and checkpoints finished rows so an interrupted
+run can be resumed without regenerating them.
+
+Usage:
+    python batch_generate.py catalog.csv --concurrency 4 --rpm 60
+    python batch_generate.py catalog.jsonl --checkpoint mongo
+    python batch_generate.py catalog.csv --checkpoint refresh-2026.checkpoint  # refresh all rows
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from database import get_batch_checkpoints_collection, get_courses_collection
+from services.gemini_service import generate_course_syllabus
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("batch_generate")
+
+COURSE_FIELDS = ("title", "credits", "ltp", "audience")
+
+
+def read_rows(path: str) -> Iterator[Dict[str, str]]:
+    """Stream catalog rows from a CSV or JSONL file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            records = (
+                (line_no, json.loads(line))
+                for line_no, line in enumerate(f, start=1)
+                if line.strip()
+            )
+        else:
+            records = enumerate(csv.DictReader(f), start=2)
+
+        for line_no, record in records:
+            missing = [field for field in COURSE_FIELDS if not str(record.get(field) or "").strip()]
+            if missing:
+                raise ValueError(f"{path}:{line_no}: missing {', '.join(missing)}")
+            yield {field: str(record[field]).strip() for field in COURSE_FIELDS}
+
+
+def count_rows(path: str) -> int:
+    """Count catalog rows without holding them in memory"""
+    return sum(1 for _ in read_rows(path))
+
+
+def row_key(row: Dict[str, str]) -> str:
+    """Stable identifier of a catalog row, independent of its position in the file"""
+    payload = json.dumps([row[field] for field in COURSE_FIELDS], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FileCheckpoint:
+    """Checkpoint stored as one finished row key per line in a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Set[str]:
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def mark(self, keys: List[str]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(f"{key}\n" for key in keys)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class MongoCheckpoint:
+    """Checkpoint stored in the batch_checkpoints collection, scoped by run name"""
+
+    def __init__(self, run: str):
+        self.run = run
+        self.collection = get_batch_checkpoints_collection()
+
+    def load(self) -> Set[str]:
+        return {doc["key"] for doc in self.collection.find({"run": self.run}, {"key": 1})}
+
+    def mark(self, keys: List[str]):
+        now = datetime.utcnow()
+        docs = [{"_id": f"{self.run}:{key}", "run": self.run, "key": key, "completed_at": now} for key in keys]
+        try:
+            self.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Duplicate keys only mean the row was already checkpointed
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+
+
+class RateLimiter:
+    """Spaces request starts so the run stays under a requests-per-minute quota"""
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            wait = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class Progress:
+    """Tracks throughput and estimates the time remaining"""
+
+    def __init__(self, total: int, every: float):
+        self.total = total
+        self.every = every
+        self.started = time.monotonic()
+        self.last_report = 0.0
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def report(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.last_report < self.every:
+            return
+        self.last_report = now
+
+        processed = self.succeeded + self.failed
+        elapsed = now - self.started
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - self.skipped - processed, 0)
+        eta = f"{remaining / rate:.0f}s" if rate > 0 else "unknown"
+        logger.info(
+            f"{processed + self.skipped}/{self.total} rows "
+            f"(ok={self.succeeded} failed={self.failed} skipped={self.skipped}) "
+            f"{rate * 60:.1f} rows/min, ETA {eta}"
+        )
+
+
+class BatchRunner:
+    """Generates syllabi for catalog rows and persists them in bulk"""
+
+    def __init__(self, checkpoint, concurrency: int, rpm: float, batch_size: int, progress: Progress):
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.progress = progress
+        self.limiter = RateLimiter(rpm)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        # Separate pool so saving a batch never waits behind slow generations
+        self.db_executor = ThreadPoolExecutor(max_workers=1)
+        self.stopping = False
+        self.worker_failed = asyncio.Event()
+        self.pending: List[Dict[str, Any]] = []
+        self.flush_lock = asyncio.Lock()
+
+    async def run(self, rows: Iterator[Dict[str, str]]):
+        done = self.checkpoint.load()
+        if done:
+            logger.info(f"Resuming: {len(done)} rows already completed")
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.db_executor,
+            lambda: get_courses_collection().create_index("batch_key", unique=True, sparse=True),
+        )
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        workers = [asyncio.create_task(self.worker(queue)) for _ in range(self.concurrency)]
+
+        try:
+            seen: Set[str] = set()
+            for row in rows:
+                key = row_key(row)
+                if key in done or key in seen:
+                    self.progress.skipped += 1
+                    continue
+                seen.add(key)
+                if not await self.feed(queue, (key, row)):
+                    break
+            else:
+                for _ in workers:
+                    if not await self.feed(queue, None):
+                        break
+            if self.worker_failed.is_set():
+                logger.error("A worker stopped unexpectedly; stopping the run")
+                self.stop_feeding(queue)
+        except BaseException:
+            # On Ctrl+C stop feeding and drop rows that have not started, but
+            # let generations already in flight finish so they can be saved
+            self.stop_feeding(queue)
+            raise
+        finally:
+            results = await asyncio.gather(*workers, return_exceptions=True)
+            await self.flush(final=True)
+            self.executor.shutdown()
+            self.db_executor.shutdown()
+            self.progress.report(force=True)
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    async def feed(self, queue: asyncio.Queue, item) -> bool:
+        """Queue an item for the workers; returns False if a worker has died instead"""
+        if self.worker_failed.is_set():
+            return False
+        put = asyncio.ensure_future(queue.put(item))
+        failed = asyncio.ensure_future(self.worker_failed.wait())
+        await asyncio.wait({put, failed}, return_when=asyncio.FIRST_COMPLETED)
+        failed.cancel()
+        if put.done():
+            return True
+        put.cancel()
+        return False
+
+    def stop_feeding(self, queue: asyncio.Queue):
+        self.stopping = True
+        while not queue.empty():
+            queue.get_nowait()
+        # The queue was just emptied, so there is room for every sentinel
+        for _ in range(self.concurrency):
+            queue.put_nowait(None)
+
+    async def worker(self, queue: asyncio.Queue):
+        try:
+            await self.process(queue)
+        except BaseException:
+            self.worker_failed.set()
+            raise
+
+    async def process(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            key, row = item
+
+            await self.limiter.acquire()
+            if self.stopping:
+                return
+            try:
+                result = await loop.run_in_executor(
+                    self.executor,
+                    generate_course_syllabus,
+                    row["title"], row["credits"], row["ltp"], row["audience"],
+                )
+            except Exception as e:
+                result = {"error": str(e)}
+
+            if result.get("fallback"):
+                result = {"error": "model response could not be parsed"}
+            if "error" in result:
+                # Not checkpointed, so the row is retried on the next run
+                logger.error(f"Course generation failed for {row['title']}: {result['error']}")
+                self.progress.failed += 1
+            else:
+                self.pending.append({**row, **result, "batch_key": key})
+                self.progress.succeeded += 1
+                if len(self.pending) >= self.batch_size:
+                    await self.flush()
+            self.progress.report()
+
+    async def flush(self, final: bool = False):
+        async with self.flush_lock:
+            if not self.pending:
+                return
+            docs, self.pending = self.pending, []
+            keys = [doc["batch_key"] for doc in docs]
+
+            loop = asyncio.get_running_loop()
+            # Courses are upserted by row key before their rows are checkpointed,
+            # so a crash between the two regenerates a row but never duplicates it.
+            # $set lets a regenerated row replace the stored syllabus.
+            writes = [UpdateOne({"batch_key": doc["batch_key"]}, {"$set": doc}, upsert=True) for doc in docs]
+            try:
+                result = await loop.run_in_executor(
+                    self.db_executor,
+                    lambda: get_courses_collection().bulk_write(writes, ordered=False),
+                )
+                await loop.run_in_executor(self.db_executor, self.checkpoint.mark, keys)
+            except Exception as e:
+                if final:
+                    logger.error(f"Failed to save {len(docs)} courses, they will be regenerated on the next run: {e}")
+                    self.progress.succeeded -= len(docs)
+                    self.progress.failed += len(docs)
+                else:
+                    # Keep the batch and retry it with the next flush
+                    logger.error(f"Failed to save {len(docs)} courses, will retry: {e}")
+                    self.pending = docs + self.pending
+                return
+            logger.info(f"Saved {len(docs)} courses ({result.upserted_count} new, {result.modified_count} updated)")
+
+
+def build_checkpoint(spec: Optional[str], input_path: str):
+    if spec == "mongo" or (spec or "").startswith("mongo:"):
+        run = spec.partition(":")[2] or os.path.basename(input_path)
+        return MongoCheckpoint(run)
+    return FileCheckpoint(spec or f"{input_path}.checkpoint")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate syllabi for a course catalog")
+    parser.add_argument("input", help="CSV or JSONL file with title, credits, ltp and audience columns")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum generations in flight (default: 4)")
+    parser.add_argument("--rpm", type=float, default=60, help="Maximum requests per minute, 0 for no limit (default: 60)")
+    parser.add_argument("--batch-size", type=int, default=25, help="Courses per bulk insert (default: 25)")
+    parser.add_argument(
+        "--checkpoint",
+        help="'mongo' or 'mongo:<run>' to checkpoint in the database, or a file path (default: <input>.checkpoint)",
+    )
+    parser.add_argument("--progress-every", type=float, default=10, help="Seconds between progress reports (default: 10)")
+    args = parser.parse_args()
+
+    if args.concurrency < 1 or args.batch_size < 1:
+        parser.error("--concurrency and --batch-size must be at least 1")
+
+    total = count_rows(args.input)
+    logger.info(f"Catalog {args.input}: {total} rows")
+
+    runner = BatchRunner(
+        checkpoint=build_checkpoint(args.checkpoint, args.input),
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        batch_size=args.batch_size,
+        progress=Progress(total, args.progress_every),
+    )
+    try:
+        asyncio.run(runner.run(read_rows(args.input)))
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; re-run the same command to resume")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold vs. cached course export latency.
+
+Renders a set of sample courses into a temporary export directory, then
+requests the same exports again so they are served from the cache.
+
+Usage:
+    python bench_export.py --courses 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+from services import export_service
+
+
+def sample_course(index: int) -> dict:
+    return {
+        "title": f"Sample Course {index}",
+        "credits": "4",
+        "ltp": "3:0:2",
+        "audience": "Undergraduate",
+        "course_title": f"Sample Course {index}",
+        "duration": "12 weeks",
+        "target_audience": "Undergraduate",
+        "course_goals": [f"Goal {n} for course {index}" for n in range(5)],
+        "tools_and_technologies": {
+            "programming_language": "Python",
+            "development_environment": "Jupyter Notebooks",
+            "key_libraries": ["NumPy", "Pandas", "Matplotlib"],
+        },
+        "weekly_breakdown": [
+            {
+                "week": week,
+                "theme": f"Theme for week {week}",
+                "learning_objectives": [f"Objective {n}" for n in range(3)],
+                "daily_plan": [
+                    {
+                        "day": day,
+                        "topic": f"Topic {week}.{day}",
+                        "description": "An overview of the topic with worked examples and discussion. " * 3,
+                        "lab": "Hands-on exercises applying the topic",
+                    }
+                    for day in range(1, 4)
+                ],
+            }
+            for week in range(1, 13)
+        ],
+        "assessment": {"details": [{"type": "Assignments", "weight": "40%"}, {"type": "Final Project", "weight": "60%"}]},
+        "recommended_resources": {
+            "books": [{"title": "Essential Textbook", "author": "Expert Author"}],
+            "online_platforms": ["Coursera", "edX"],
+        },
+    }
+
+
+def summarize(label: str, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:<14} median {statistics.median(samples) * 1000:8.2f} ms   p95 {p95 * 1000:8.2f} ms")
+
+
+async def timed_exports(courses, fmt: str):
+    samples = []
+    for course in courses:
+        started = time.perf_counter()
+        await export_service.export_course(course, fmt)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def run(count: int):
+    courses = [sample_course(i) for i in range(count)]
+    with tempfile.TemporaryDirectory() as export_dir:
+        export_service.EXPORT_DIR = export_dir
+        # Start the worker processes so pool startup is not counted as render time
+        await asyncio.get_running_loop().run_in_executor(export_service.get_export_pool(), time.sleep, 0)
+        try:
+            for fmt in export_service.EXPORT_FORMATS:
+                summarize(f"{fmt} cold", await timed_exports(courses, fmt))
+                summarize(f"{fmt} cached", await timed_exports(courses, fmt))
+        finally:
+            export_service.shutdown_export_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold vs. cached course exports")
+    parser.add_argument("--courses", type=int, default=20, help="Number of distinct courses to export (default: 20)")
+    args = parser.parse_args()
+    asyncio.run(run(args.courses))
+
+
+if __name__ == "__main__":
+    main()
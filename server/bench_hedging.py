@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark request hedging against a local variable-latency stub.
+
+The stub behaves like a short Gemini call: most requests finish quickly but
+a small fraction hang for much longer. The same workload is run without and
+with hedging and the observed p50/p95/p99 latencies are reported.
+
+Usage:
+    python bench_hedging.py --calls 400 --tail-prob 0.03 --tail-latency 1.0
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.hedging import HedgedCaller, percentile
+
+
+class StubModel:
+    """Stand-in for a Gemini model with a long-tailed latency distribution"""
+
+    def __init__(self, base_latency: float, tail_prob: float, tail_latency: float, seed: int):
+        self.base_latency = base_latency
+        self.tail_prob = tail_prob
+        self.tail_latency = tail_latency
+        self.random = random.Random(seed)
+        self.requests = 0
+
+    def generate_content(self, prompt: str) -> str:
+        self.requests += 1
+        if self.random.random() < self.tail_prob:
+            latency = self.tail_latency * self.random.uniform(0.5, 1.5)
+        else:
+            latency = self.random.lognormvariate(0, 0.3) * self.base_latency
+        time.sleep(latency)
+        return prompt
+
+
+def run(args, hedger=None):
+    model = StubModel(args.base_latency, args.tail_prob, args.tail_latency, args.seed)
+    call = model.generate_content if hedger is None else (lambda prompt: hedger.call(model.generate_content, prompt))
+
+    def timed(i):
+        started = time.perf_counter()
+        call(f"prompt {i}")
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(timed, range(args.calls)))
+    return latencies, model.requests
+
+
+def report(label: str, latencies, requests: int, calls: int):
+    print(
+        f"{label:<10} p50 {percentile(latencies, 50) * 1000:7.1f} ms   "
+        f"p95 {percentile(latencies, 95) * 1000:7.1f} ms   "
+        f"p99 {percentile(latencies, 99) * 1000:7.1f} ms   "
+        f"requests {requests} (+{(requests - calls) / calls:.1%})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hedged requests against a variable-latency stub")
+    parser.add_argument("--calls", type=int, default=400, help="Calls per run (default: 400)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent callers (default: 8)")
+    parser.add_argument("--base-latency", type=float, default=0.05, help="Typical latency in seconds (default: 0.05)")
+    parser.add_argument("--tail-prob", type=float, default=0.03, help="Fraction of slow requests (default: 0.03)")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="Latency of slow requests in seconds (default: 1.0)")
+    parser.add_argument("--percentile", type=float, default=95, help="Hedge after this latency percentile (default: 95)")
+    parser.add_argument("--budget", type=float, default=0.1, help="Maximum fraction of calls that may be hedged (default: 0.1)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the stub (default: 1)")
+    args = parser.parse_args()
+
+    latencies, requests = run(args)
+    report("baseline", latencies, requests, args.calls)
+
+    hedger = HedgedCaller(hedge_percentile=args.percentile, budget=args.budget)
+    latencies, requests = run(args, hedger)
+    report("hedged", latencies, requests, args.calls)
+    stats = hedger.stats()
+    print(f"hedges {stats['hedges']}, won by the backup {stats['hedge_wins']}, hedge delay {stats['hedge_delay'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
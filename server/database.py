@@ -47,4 +47,7 @@ def get_outcomes_collection():
     return get_database().outcomes
 
 def get_books_collection():
-    return get_database().books 
\ No newline at end of file
+    return get_database().books
+
+def get_batch_checkpoints_collection():
+    return get_database().batch_checkpoints 
\ No newline at end of file
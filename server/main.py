@@ -1,10 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 from dotenv import load_dotenv
 
-from routes import course_routes, syllabus_routes, outcome_routes, book_routes
+from routes import course_routes, syllabus_routes, outcome_routes, book_routes, export_routes
+from services.export_service import shutdown_export_pool, start_export_eviction, stop_export_eviction
+from static_files import RangeStaticFiles
 
 load_dotenv()
 
@@ -32,13 +33,23 @@ app.add_middleware(
 
 # Mount static files for uploads
 os.makedirs("uploads", exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", RangeStaticFiles(directory="uploads"), name="uploads")
 
 # Include routes
 app.include_router(course_routes.router, prefix="/api", tags=["courses"])
 app.include_router(syllabus_routes.router, prefix="/api", tags=["syllabus"])
 app.include_router(outcome_routes.router, prefix="/api", tags=["outcomes"])
 app.include_router(book_routes.router, prefix="/api", tags=["books"])
+app.include_router(export_routes.router, prefix="/api", tags=["export"])
+
+@app.on_event("startup")
+async def startup():
+    start_export_eviction()
+
+@app.on_event("shutdown")
+def shutdown():
+    stop_export_eviction()
+    shutdown_export_pool()
 
 @app.get("/")
 async def root():
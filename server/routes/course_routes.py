@@ -34,7 +34,8 @@ async def generate_course(course: CourseInput):
         
         # Save to DB
         try:
-            get_courses_collection().insert_one({**course.dict(), **result})
+            inserted = get_courses_collection().insert_one({**course.dict(), **result})
+            result["course_id"] = str(inserted.inserted_id)
         except Exception as db_error:
             logger.warning(f"Failed to save to database: {db_error}")
             # Don't fail the request if DB save fails
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import RedirectResponse
+from bson import ObjectId
+from bson.errors import InvalidId
+from services.export_service import export_course
+from database import get_courses_collection
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/courses/{course_id}/export")
+async def export_course_document(course_id: str, format: str = Query("docx", regex="^(docx|pdf)$")):
+    try:
+        object_id = ObjectId(course_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid course id.")
+
+    course = get_courses_collection().find_one({"_id": object_id})
+    if course is None:
+        raise HTTPException(status_code=404, detail="Course not found.")
+
+    try:
+        url = await export_course(course, format)
+    except Exception as e:
+        logger.error(f"Export of course {course_id} failed: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Failed to export course",
+                "details": str(e)
+            }
+        )
+    # Served by the /uploads static mount, which supports range requests
+    return RedirectResponse(url, status_code=303)
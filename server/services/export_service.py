@@ -0,0 +1,317 @@
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from docx import Document
+
+EXPORT_DIR = os.path.join("uploads", "exports")
+EXPORT_URL_PREFIX = "/uploads/exports"
+EXPORT_FORMATS = ("docx", "pdf")
+
+# Bump when the document layout changes so stale renders are not served
+RENDER_VERSION = 1
+
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "2"))
+EXPORT_CACHE_MAX_BYTES = int(float(os.getenv("EXPORT_CACHE_MAX_MB", "200")) * 1024 * 1024)
+EXPORT_CACHE_MAX_AGE = float(os.getenv("EXPORT_CACHE_MAX_AGE_HOURS", "168")) * 3600
+# Files used this recently are never evicted, so a URL just handed out stays valid
+EXPORT_CACHE_GRACE = float(os.getenv("EXPORT_CACHE_GRACE_SECONDS", "300"))
+EXPORT_EVICTION_INTERVAL = float(os.getenv("EXPORT_EVICTION_INTERVAL_SECONDS", "3600"))
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_eviction_task: Optional["asyncio.Task"] = None
+_in_flight: Dict[str, "asyncio.Task"] = {}
+
+Block = Tuple[str, str]
+
+
+def get_export_pool() -> ProcessPoolExecutor:
+    """Get the process pool used for CPU-bound document rendering"""
+    global _pool
+    if _pool is None:
+        # Spawn rather than fork: the server process has Mongo and thread pool
+        # threads running, and forking them can deadlock a worker on a held lock
+        _pool = ProcessPoolExecutor(max_workers=EXPORT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_export_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def export_content_hash(course: Dict[str, Any], fmt: str) -> str:
+    """Hash of the course content, format and layout version, used as the cache key"""
+    payload = json.dumps(
+        {"course": course, "format": fmt, "version": RENDER_VERSION},
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def course_blocks(course: Dict[str, Any]) -> List[Block]:
+    """Flatten a generated course document into (kind, text) blocks shared by all renderers"""
+    blocks: List[Block] = [("title", course.get("course_title") or course.get("title") or "Course Syllabus")]
+
+    details = [
+        ("Credits", course.get("credits")),
+        ("L:T:P", course.get("ltp")),
+        ("Audience", course.get("target_audience") or course.get("audience")),
+        ("Duration", course.get("duration")),
+    ]
+    blocks += [("para", f"{label}: {value}") for label, value in details if value]
+
+    goals = course.get("course_goals") or []
+    if goals:
+        blocks.append(("heading", "Course Goals"))
+        blocks += [("bullet", str(goal)) for goal in goals]
+
+    tools = course.get("tools_and_technologies") or {}
+    if tools:
+        blocks.append(("heading", "Tools and Technologies"))
+        for key, value in tools.items():
+            if isinstance(value, list):
+                value = ", ".join(str(item) for item in value)
+            blocks.append(("bullet", f"{key.replace('_', ' ').capitalize()}: {value}"))
+
+    for week in course.get("weekly_breakdown") or []:
+        blocks.append(("heading", f"Week {week.get('week', '')}: {week.get('theme', '')}".strip(": ")))
+        objectives = week.get("learning_objectives") or []
+        if objectives:
+            blocks.append(("subheading", "Learning Objectives"))
+            blocks += [("bullet", str(objective)) for objective in objectives]
+        for day in week.get("daily_plan") or []:
+            blocks.append(("subheading", f"Day {day.get('day', '')}: {day.get('topic', '')}".strip(": ")))
+            if day.get("description"):
+                blocks.append(("para", day["description"]))
+            if day.get("lab"):
+                blocks.append(("para", f"Lab: {day['lab']}"))
+
+    assessments = (course.get("assessment") or {}).get("details") or []
+    if assessments:
+        blocks.append(("heading", "Assessment"))
+        blocks += [("bullet", f"{item.get('type', '')}: {item.get('weight', '')}") for item in assessments]
+
+    resources = course.get("recommended_resources") or {}
+    books = resources.get("books") or []
+    platforms = resources.get("online_platforms") or []
+    if books or platforms:
+        blocks.append(("heading", "Recommended Resources"))
+        blocks += [("bullet", f"{book.get('title', '')} by {book.get('author', '')}") for book in books]
+        if platforms:
+            blocks.append(("para", f"Online platforms: {', '.join(str(p) for p in platforms)}"))
+
+    return blocks
+
+
+def render_docx(blocks: List[Block], path: str):
+    doc = Document()
+    for kind, text in blocks:
+        if kind == "title":
+            doc.add_heading(text, level=0)
+        elif kind == "heading":
+            doc.add_heading(text, level=1)
+        elif kind == "subheading":
+            doc.add_heading(text, level=2)
+        elif kind == "bullet":
+            doc.add_paragraph(text, style="List Bullet")
+        else:
+            doc.add_paragraph(text)
+    doc.save(path)
+
+
+# A4 page layout for the built-in PDF writer, in points
+PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT, PDF_MARGIN = 595, 842, 56
+PDF_STYLES = {
+    # kind: (font, size, leading, indent, space before)
+    "title": ("F2", 18, 24, 0, 0),
+    "heading": ("F2", 13, 18, 0, 10),
+    "subheading": ("F2", 11, 15, 0, 6),
+    "bullet": ("F1", 10, 14, 14, 0),
+    "para": ("F1", 10, 14, 0, 2),
+}
+
+
+def _pdf_escape(text: str) -> bytes:
+    text = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return text.encode("cp1252", "replace")
+
+
+def render_pdf(blocks: List[Block], path: str):
+    """Write a plain text PDF using the standard Helvetica fonts, so no extra dependency is needed"""
+    pages: List[List[bytes]] = [[]]
+    y = PDF_PAGE_HEIGHT - PDF_MARGIN
+    for kind, text in blocks:
+        font, size, leading, indent, space = PDF_STYLES.get(kind, PDF_STYLES["para"])
+        # Helvetica averages about half an em per character
+        width = int((PDF_PAGE_WIDTH - 2 * PDF_MARGIN - indent) / (size * 0.5))
+        lines = textwrap.wrap(text, width) or [""]
+        if kind == "bullet":
+            lines[0] = "• " + lines[0]
+            lines[1:] = ["  " + line for line in lines[1:]]
+        y -= space
+        for line in lines:
+            if y - leading < PDF_MARGIN:
+                pages.append([])
+                y = PDF_PAGE_HEIGHT - PDF_MARGIN
+            y -= leading
+            pages[-1].append(
+                b"BT /%s %d Tf %d %d Td (%s) Tj ET"
+                % (font.encode(), size, PDF_MARGIN + indent, y, _pdf_escape(line))
+            )
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for commands in pages:
+        stream = b"\n".join(commands)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+            % (PDF_PAGE_WIDTH, PDF_PAGE_HEIGHT, len(objects))
+        )
+        page_refs.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(page_refs), len(page_refs))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def render_export(course: Dict[str, Any], fmt: str, path: str):
+    """Render a course to path; runs in a worker process"""
+    # Render to a temporary file first so a half-written export is never served
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        if fmt == "docx":
+            render_docx(course_blocks(course), tmp_path)
+        else:
+            render_pdf(course_blocks(course), tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def evict_exports():
+    """Remove exports not used within the max age, then least recently used ones over the size limit.
+
+    Files used within the grace period are kept either way, even if that
+    leaves the cache over its size limit for a while.
+    """
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    now = time.time()
+    entries = []
+    total = 0
+    for entry in os.scandir(EXPORT_DIR):
+        if not entry.is_file() or entry.name.endswith(".tmp"):
+            continue
+        stat = entry.stat()
+        idle = now - stat.st_atime
+        if idle < EXPORT_CACHE_GRACE:
+            total += stat.st_size
+        elif idle > EXPORT_CACHE_MAX_AGE:
+            _remove_quietly(entry.path)
+        else:
+            total += stat.st_size
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+
+    for _, size, path in sorted(entries):
+        if total <= EXPORT_CACHE_MAX_BYTES:
+            break
+        _remove_quietly(path)
+        total -= size
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _render_and_evict(course: Dict[str, Any], fmt: str, path: str):
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_export_pool(), render_export, course, fmt, path)
+    await loop.run_in_executor(None, evict_exports)
+
+
+async def _evict_periodically():
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, evict_exports)
+        except OSError as e:
+            logger.error(f"Export cache eviction failed: {e}")
+        await asyncio.sleep(EXPORT_EVICTION_INTERVAL)
+
+
+def start_export_eviction():
+    """Enforce the cache limits at startup and then periodically, even when nothing new is rendered"""
+    global _eviction_task
+    if _eviction_task is None:
+        _eviction_task = asyncio.ensure_future(_evict_periodically())
+
+
+def stop_export_eviction():
+    global _eviction_task
+    if _eviction_task is not None:
+        _eviction_task.cancel()
+        _eviction_task = None
+
+
+async def export_course(course: Dict[str, Any], fmt: str) -> str:
+    """Render a course document to DOCX or PDF, reusing a cached render when the content is unchanged.
+
+    Returns the URL of the file under the /uploads static mount.
+    """
+    course = {key: value for key, value in course.items() if key != "_id"}
+    filename = f"{export_content_hash(course, fmt)}.{fmt}"
+    path = os.path.join(EXPORT_DIR, filename)
+    url = f"{EXPORT_URL_PREFIX}/{filename}"
+
+    try:
+        stat = os.stat(path)
+        # Record the access time explicitly for eviction; keep mtime so ETags stay stable
+        os.utime(path, (time.time(), stat.st_mtime))
+        return url
+    except FileNotFoundError:
+        pass
+
+    # Concurrent requests for the same document share a single render
+    task = _in_flight.get(filename)
+    if task is None:
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        task = asyncio.ensure_future(_render_and_evict(course, fmt, path))
+        _in_flight[filename] = task
+        task.add_done_callback(lambda _: _in_flight.pop(filename, None))
+    await asyncio.shield(task)
+    return url
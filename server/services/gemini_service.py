@@ -4,16 +4,39 @@ from dotenv import load_dotenv
 import json
 from typing import Dict, Any
 import re
+from services.hedging import HedgedCaller
 
 load_dotenv()
 
 # Configure Gemini
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
+# Opt-in request hedging for short prompts
+HEDGING_ENABLED = os.getenv("GEMINI_HEDGING", "false").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.getenv("GEMINI_HEDGE_PERCENTILE", "95"))
+HEDGE_BUDGET = float(os.getenv("GEMINI_HEDGE_BUDGET", "0.05"))
+# Upper bound on a single hedged call
+HEDGE_TIMEOUT = float(os.getenv("GEMINI_HEDGE_TIMEOUT_SECONDS", "30"))
+
+_hedgers: Dict[str, HedgedCaller] = {}
+
 def get_gemini_model():
     """Get the Gemini Flash model for faster responses"""
     return genai.GenerativeModel('gemini-1.5-flash')
 
+def get_hedger(name: str) -> HedgedCaller:
+    """Get the hedging policy for one kind of prompt, so each tracks its own latency"""
+    if name not in _hedgers:
+        _hedgers[name] = HedgedCaller(hedge_percentile=HEDGE_PERCENTILE, budget=HEDGE_BUDGET)
+    return _hedgers[name]
+
+def generate_content_hedged(model, prompt: str, name: str):
+    """Call generate_content, hedging slow calls when GEMINI_HEDGING is enabled"""
+    if not HEDGING_ENABLED:
+        return model.generate_content(prompt)
+    # Hedged calls are bounded so an abandoned loser releases its worker thread
+    return get_hedger(name).call(model.generate_content, prompt, request_options={"timeout": HEDGE_TIMEOUT})
+
 def generate_course_syllabus(title: str, credits: str, ltp: str, audience: str) -> Dict[str, Any]:
     """Generate a complete course syllabus using Gemini"""
     
@@ -162,8 +185,9 @@ def generate_course_syllabus(title: str, credits: str, ltp: str, audience: str)
                 result = json.loads(content)
             except json.JSONDecodeError:
                 print("Failed to parse JSON, using fallback response")
-                # Return a structured fallback response
+                # Return a structured fallback response, flagged so callers can tell it apart
                 result = {
+                    "fallback": True,
                     "course_title": title,
                     "duration": "3-4 weeks",
                     "target_audience": audience,
@@ -278,7 +302,7 @@ def check_outcome_quality(outcome_text: str) -> Dict[str, Any]:
     
     try:
         model = get_gemini_model()
-        response = model.generate_content(prompt)
+        response = generate_content_hedged(model, prompt, "check_outcome")
         
         content = response.text.strip()
         if content.startswith("```json"):
@@ -377,7 +401,7 @@ def recommend_textbooks(subject: str, audience: str) -> Dict[str, Any]:
     
     try:
         model = get_gemini_model()
-        response = model.generate_content(prompt)
+        response = generate_content_hedged(model, prompt, "recommend_textbooks")
         
         content = response.text.strip()
         if content.startswith("```json"):
@@ -0,0 +1,137 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sequence"""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class HedgedCaller:
+    """Runs a blocking call and fires one identical backup request when it is slow.
+
+    The backup is sent once the call has been running longer than the given
+    percentile of recently observed latencies, and whichever request finishes
+    first wins. A token bucket caps hedges at `budget` (a fraction of all
+    calls) so the extra quota spend stays bounded.
+
+    The losing request is cancelled if it has not started yet; a blocking
+    call already in flight cannot be interrupted, so its result is discarded
+    and `fn` should enforce its own timeout to release the thread. When every
+    worker thread is busy, calls run directly in the caller's thread without
+    hedging rather than queueing behind stuck requests.
+    """
+
+    def __init__(
+        self,
+        hedge_percentile: float = 95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        max_burst: float = 5,
+        max_workers: int = 32,
+    ):
+        self.hedge_percentile = hedge_percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.max_burst = max_burst
+        self.latencies = deque(maxlen=window)
+        self.tokens = 0.0
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.in_flight = 0
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedged-call")
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there are too few samples"""
+        with self.lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            return percentile(self.latencies, self.hedge_percentile)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_delay": percentile(self.latencies, self.hedge_percentile) if self.latencies else None,
+            }
+
+    def call(self, fn: Callable, *args, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.tokens = min(self.tokens + self.budget, self.max_burst)
+
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._timed(fn, args, kwargs)
+        primary = self._submit(fn, args, kwargs)
+        if primary is None:
+            return self._timed(fn, args, kwargs)
+
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_token():
+            return primary.result()
+
+        hedge = self._submit(fn, args, kwargs)
+        if hedge is None:
+            # No free thread for the backup; give the token back and keep waiting
+            with self.lock:
+                self.tokens += 1
+                self.hedges -= 1
+            return primary.result()
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        with self.lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _submit(self, fn: Callable, args, kwargs) -> Optional[Future]:
+        """Run fn on a free worker thread, or return None when all are busy"""
+        with self.lock:
+            if self.in_flight >= self.max_workers:
+                return None
+            self.in_flight += 1
+        future = self.executor.submit(self._timed, fn, args, kwargs)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future):
+        with self.lock:
+            self.in_flight -= 1
+
+    def _take_token(self) -> bool:
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            self.hedges += 1
+            return True
+
+    def _timed(self, fn: Callable, args, kwargs):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        # Every completed request is recorded, losers included, so the window
+        # reflects upstream latency rather than the hedged latency
+        with self.lock:
+            self.latencies.append(time.perf_counter() - started)
+        return result
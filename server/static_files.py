@@ -0,0 +1,95 @@
+import os
+import re
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response, StreamingResponse
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header: str, size: int):
+    """Parse a single-range Range header into (start, end), inclusive.
+
+    Returns None when the header should be ignored (malformed, multi-range or
+    an empty file), which means serving the whole file, and raises ValueError
+    when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or size == 0:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        # Syntactically invalid per RFC 7233 section 2.1, so it is ignored
+        return None
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+class RangeStaticFiles(StaticFiles):
+    """StaticFiles that honours single byte-range requests (206 Partial Content)"""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if response.status_code != 200:
+            return response
+        response.headers["accept-ranges"] = "bytes"
+
+        request_headers = Headers(scope=scope)
+        range_header = request_headers.get("range")
+        if not range_header:
+            return response
+        if_range = request_headers.get("if-range")
+        if if_range and if_range not in (response.headers["etag"], response.headers["last-modified"]):
+            return response
+
+        size = stat_result.st_size
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={"content-range": f"bytes */{size}"})
+        if byte_range is None:
+            return response
+
+        start, end = byte_range
+        headers = {
+            key: response.headers[key]
+            for key in ("content-type", "last-modified", "etag")
+            if key in response.headers
+        }
+        headers.update({
+            "accept-ranges": "bytes",
+            "content-range": f"bytes {start}-{end}/{size}",
+            "content-length": str(end - start + 1),
+        })
+        if scope["method"] == "HEAD":
+            return Response(status_code=206, headers=headers)
+        return StreamingResponse(self.read_range(full_path, start, end), status_code=206, headers=headers)
+
+    @staticmethod
+    async def read_range(full_path, start: int, end: int):
+        async with await anyio.open_file(full_path, mode="rb") as f:
+            await f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
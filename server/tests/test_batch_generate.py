@@ -0,0 +1,174 @@
+import asyncio
+import json
+
+import pytest
+
+import batch_generate
+from batch_generate import BatchRunner, FileCheckpoint, Progress, read_rows, row_key
+
+ROWS = [
+    {"title": f"Course {i}", "credits": "3", "ltp": "3:0:0", "audience": "Undergraduate"}
+    for i in range(6)
+]
+
+
+class FakeBulkResult:
+    def __init__(self, upserted_count, modified_count):
+        self.upserted_count = upserted_count
+        self.modified_count = modified_count
+
+
+class FakeCourses:
+    """In-memory stand-in for the courses collection, honouring upserts by batch_key"""
+
+    def __init__(self):
+        self.docs = {}
+        self.fail_writes = 0
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+    def bulk_write(self, writes, ordered=True):
+        if self.fail_writes:
+            self.fail_writes -= 1
+            raise RuntimeError("write failed")
+        upserted = 0
+        for write in writes:
+            doc = write._doc["$set"]
+            upserted += doc["batch_key"] not in self.docs
+            self.docs[doc["batch_key"]] = dict(doc)
+        return FakeBulkResult(upserted, len(writes) - upserted)
+
+
+@pytest.fixture
+def courses(monkeypatch):
+    collection = FakeCourses()
+    monkeypatch.setattr(batch_generate, "get_courses_collection", lambda: collection)
+    return collection
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    calls = []
+
+    def fake_generate(title, credits, ltp, audience):
+        calls.append(title)
+        return {"course_title": title, "attempt": calls.count(title)}
+
+    monkeypatch.setattr(batch_generate, "generate_course_syllabus", fake_generate)
+    return calls
+
+
+def run_batch(rows, checkpoint, batch_size=2, concurrency=2):
+    runner = BatchRunner(checkpoint, concurrency=concurrency, rpm=0, batch_size=batch_size, progress=Progress(len(rows), 60))
+    asyncio.run(asyncio.wait_for(runner.run(iter(rows)), timeout=10))
+    return runner
+
+
+def test_read_rows_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "catalog.csv"
+    csv_path.write_text("title,credits,ltp,audience,extra\n Databases ,4,3:0:2,UG,x\n")
+    jsonl_path = tmp_path / "catalog.jsonl"
+    jsonl_path.write_text(json.dumps({"title": "Databases", "credits": 4, "ltp": "3:0:2", "audience": "UG"}) + "\n\n")
+
+    expected = [{"title": "Databases", "credits": "4", "ltp": "3:0:2", "audience": "UG"}]
+    assert list(read_rows(str(csv_path))) == expected
+    assert list(read_rows(str(jsonl_path))) == expected
+
+
+def test_read_rows_missing_field(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text("title,credits,ltp,audience\nDatabases,4,,UG\n")
+    with pytest.raises(ValueError, match="catalog.csv:2: missing ltp"):
+        list(read_rows(str(path)))
+
+
+def test_row_key_is_stable():
+    row = dict(ROWS[0])
+    assert row_key(row) == row_key(dict(reversed(list(row.items()))))
+    assert row_key(row) != row_key({**row, "credits": "4"})
+
+
+def test_file_checkpoint_round_trip(tmp_path):
+    checkpoint = FileCheckpoint(str(tmp_path / "run.checkpoint"))
+    assert checkpoint.load() == set()
+    checkpoint.mark(["a", "b"])
+    checkpoint.mark(["c"])
+    assert FileCheckpoint(checkpoint.path).load() == {"a", "b", "c"}
+
+
+def test_resume_skips_finished_rows(tmp_path, courses, generated):
+    checkpoint = FileCheckpoint(str(tmp_path / "run.checkpoint"))
+    checkpoint.mark([row_key(row) for row in ROWS[:4]])
+
+    runner = run_batch(ROWS, checkpoint)
+
+    assert sorted(generated) == ["Course 4", "Course 5"]
+    assert runner.progress.skipped == 4
+    assert checkpoint.load() == {row_key(row) for row in ROWS}
+
+
+def test_no_duplicates_after_crash_between_save_and_checkpoint(tmp_path, courses, generated):
+    checkpoint = FileCheckpoint(str(tmp_path / "run.checkpoint"))
+    original_mark = checkpoint.mark
+    checkpoint.mark = lambda keys: (_ for _ in ()).throw(OSError("disk full"))
+    run_batch(ROWS, checkpoint)
+    assert len(courses.docs) == len(ROWS)
+    assert checkpoint.load() == set()
+
+    checkpoint.mark = original_mark
+    run_batch(ROWS, checkpoint)
+
+    assert len(courses.docs) == len(ROWS)
+    # The regenerated rows replace the stored syllabi
+    assert all(doc["attempt"] == 2 for doc in courses.docs.values())
+
+
+def test_failed_write_is_retried_and_does_not_hang(tmp_path, courses, generated):
+    checkpoint = FileCheckpoint(str(tmp_path / "run.checkpoint"))
+    courses.fail_writes = 1
+
+    runner = run_batch(ROWS, checkpoint)
+
+    assert len(courses.docs) == len(ROWS)
+    assert checkpoint.load() == {row_key(row) for row in ROWS}
+    assert runner.progress.succeeded == len(ROWS)
+
+
+def test_unsaved_rows_count_as_failed(tmp_path, courses, generated):
+    checkpoint = FileCheckpoint(str(tmp_path / "run.checkpoint"))
+    courses.fail_writes = 100
+
+    runner = run_batch(ROWS, checkpoint)
+
+    assert courses.docs == {}
+    assert checkpoint.load() == set()
+    assert runner.progress.failed == len(ROWS)
+    assert runner.progress.succeeded == 0
+
+
+def test_dead_worker_stops_the_feeder(tmp_path, courses, generated):
+    checkpoint = FileCheckpoint(str(tmp_path / "run.checkpoint"))
+    rows = [{**ROWS[0], "title": f"Course {i}"} for i in range(50)]
+    runner = BatchRunner(checkpoint, concurrency=1, rpm=0, batch_size=2, progress=Progress(len(rows), 60))
+
+    def broken_report(force=False):
+        if not force:
+            raise RuntimeError("worker bug")
+
+    runner.progress.report = broken_report
+    with pytest.raises(RuntimeError, match="worker bug"):
+        asyncio.run(asyncio.wait_for(runner.run(iter(rows)), timeout=10))
+
+
+def test_fallback_results_are_not_saved(tmp_path, courses, monkeypatch):
+    monkeypatch.setattr(
+        batch_generate, "generate_course_syllabus", lambda *args: {"course_title": "Template", "fallback": True}
+    )
+    checkpoint = FileCheckpoint(str(tmp_path / "run.checkpoint"))
+
+    runner = run_batch(ROWS, checkpoint)
+
+    assert courses.docs == {}
+    assert checkpoint.load() == set()
+    assert runner.progress.failed == len(ROWS)
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services import export_service
+
+HOUR = 3600
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_service, "EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(export_service, "EXPORT_CACHE_MAX_AGE", 24 * HOUR)
+    monkeypatch.setattr(export_service, "EXPORT_CACHE_GRACE", 300)
+    monkeypatch.setattr(export_service, "EXPORT_CACHE_MAX_BYTES", 1024)
+    return tmp_path
+
+
+def make_export(directory, name, size=100, idle=0.0):
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    used = time.time() - idle
+    os.utime(path, (used, used))
+    return path
+
+
+def remaining(directory):
+    return sorted(os.listdir(directory))
+
+
+def test_evicts_exports_past_max_age(export_dir):
+    make_export(export_dir, "old.pdf", idle=25 * HOUR)
+    make_export(export_dir, "recent.pdf", idle=HOUR)
+
+    export_service.evict_exports()
+
+    assert remaining(export_dir) == ["recent.pdf"]
+
+
+def test_evicts_least_recently_used_over_size_limit(export_dir):
+    make_export(export_dir, "a.pdf", size=500, idle=3 * HOUR)
+    make_export(export_dir, "b.pdf", size=500, idle=2 * HOUR)
+    make_export(export_dir, "c.pdf", size=500, idle=HOUR)
+
+    export_service.evict_exports()
+
+    assert remaining(export_dir) == ["b.pdf", "c.pdf"]
+
+
+def test_grace_period_protects_recent_exports(export_dir):
+    make_export(export_dir, "hit.pdf", size=2000, idle=60)
+    make_export(export_dir, "older.pdf", size=10, idle=HOUR)
+
+    export_service.evict_exports()
+
+    # hit.pdf alone is over the limit but was used within the grace period
+    assert remaining(export_dir) == ["hit.pdf"]
+
+
+def test_cache_hit_refreshes_atime_and_keeps_mtime(export_dir, monkeypatch):
+    course = {"title": "Databases"}
+    filename = f"{export_service.export_content_hash(course, 'pdf')}.pdf"
+    path = make_export(export_dir, filename, idle=10 * HOUR)
+    mtime = os.stat(path).st_mtime
+    monkeypatch.setattr(export_service, "render_export", pytest.fail)
+
+    url = asyncio.run(export_service.export_course({**course, "_id": "ignored"}, "pdf"))
+
+    assert url == f"{export_service.EXPORT_URL_PREFIX}/{filename}"
+    stat = os.stat(path)
+    assert time.time() - stat.st_atime < 60
+    assert stat.st_mtime == mtime
+
+
+def test_concurrent_exports_share_one_render(export_dir, monkeypatch):
+    renders = []
+    release = threading.Event()
+
+    def fake_render(course, fmt, path):
+        renders.append(path)
+        release.wait(5)
+        with open(path, "wb") as f:
+            f.write(b"rendered")
+
+    pool = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(export_service, "render_export", fake_render)
+    monkeypatch.setattr(export_service, "get_export_pool", lambda: pool)
+
+    async def export_concurrently():
+        course = {"title": "Databases"}
+        tasks = [asyncio.ensure_future(export_service.export_course(course, "docx")) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert len(export_service._in_flight) == 1
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    try:
+        urls = asyncio.run(export_concurrently())
+    finally:
+        pool.shutdown()
+
+    assert len(set(urls)) == 1
+    assert len(renders) == 1
+    assert export_service._in_flight == {}
@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+from services.hedging import HedgedCaller, percentile
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 31))
+    assert percentile(samples, 95) == 29
+    assert percentile(samples, 50) == 15
+    assert percentile(samples, 100) == 30
+    assert percentile([7], 99) == 7
+
+
+def warmed_caller(samples=100, **kwargs):
+    # Zero observed latency means a call is hedged as soon as it has not
+    # finished instantly, so the tests only depend on events, not timing
+    caller = HedgedCaller(min_samples=samples, **kwargs)
+    caller.latencies.extend([0.0] * samples)
+    return caller
+
+
+class Upstream:
+    """Fake upstream whose primary request blocks until the test releases it"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.requests = 0
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.requests += 1
+            is_primary = self.requests % 2 == 1
+        if is_primary:
+            self.release.wait()
+        elif self.fail:
+            # Both requests fail, so the caller has to wait for the primary too
+            self.release.set()
+        if self.fail:
+            raise RuntimeError("upstream failed")
+        return "primary" if is_primary else "backup"
+
+
+def release_primary_when_not_hedged(caller, upstream):
+    """Unblock the primary whenever the caller decides not to hedge"""
+    take_token = caller._take_token
+
+    def take_token_or_release():
+        granted = take_token()
+        if not granted:
+            upstream.release.set()
+        return granted
+
+    caller._take_token = take_token_or_release
+
+
+def test_no_hedging_until_enough_samples():
+    caller = HedgedCaller(min_samples=5, budget=1)
+    assert caller.hedge_delay() is None
+    assert caller.call(lambda: "ok") == "ok"
+    assert caller.stats()["hedges"] == 0
+
+
+def test_slow_primary_is_hedged_and_backup_wins():
+    upstream = Upstream()
+    caller = warmed_caller(budget=1)
+
+    try:
+        assert caller.call(upstream) == "backup"
+    finally:
+        upstream.release.set()
+    assert upstream.requests == 2
+    assert caller.stats()["hedges"] == 1
+    assert caller.stats()["hedge_wins"] == 1
+
+
+def test_budget_caps_hedges():
+    caller = warmed_caller(budget=0.5, max_burst=1)
+    results = []
+    for _ in range(4):
+        upstream = Upstream()
+        release_primary_when_not_hedged(caller, upstream)
+        try:
+            results.append(caller.call(upstream))
+        finally:
+            upstream.release.set()
+
+    # Half a token per call allows a backup on every second call
+    assert results == ["primary", "backup", "primary", "backup"]
+    assert caller.stats()["hedges"] == 2
+
+
+def test_saturated_pool_runs_call_directly():
+    release = threading.Event()
+    caller = warmed_caller(budget=0, max_workers=1)
+    blocker = caller._submit(release.wait, (5,), {})
+    try:
+        assert caller.call(threading.current_thread) is threading.current_thread()
+    finally:
+        release.set()
+        blocker.result()
+
+
+def test_error_raised_when_both_requests_fail():
+    caller = warmed_caller(budget=1)
+    with pytest.raises(RuntimeError, match="upstream failed"):
+        caller.call(Upstream(fail=True))
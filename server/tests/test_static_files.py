@@ -0,0 +1,33 @@
+import pytest
+
+from static_files import parse_range
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=10-", (10, 99)),
+        ("bytes=90-200", (90, 99)),
+        ("bytes=-5", (95, 99)),
+        ("bytes=-500", (0, 99)),
+    ],
+)
+def test_parse_range_satisfiable(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=5-2", "bytes=-", "items=0-9", "bytes=0-1,5-6"])
+def test_parse_range_ignored(header):
+    assert parse_range(header, 100) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=-5", "bytes=0-9", "bytes=0-"])
+def test_parse_range_empty_file_is_ignored(header):
+    assert parse_range(header, 0) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=150-200", "bytes=-0"])
+def test_parse_range_not_satisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 100)